@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: Optional[str] = Field(None, description="API key for Google Generative AI")
     ANTHROPIC_API_KEY: Optional[str] = Field(None, description="API key for Anthropic")
     LLM_PROVIDER: LLMProvider = Field(LLMProvider.OPENAI, description="LLM provider to use") # Defaulting to OpenAI for now
+    OPENAI_MAX_RETRIES: int = Field(3, description="Retries, with exponential backoff, for transient OpenAI errors (connection errors, 429s, 5xx)")
     
     # Server settings
     DEBUG: bool = Field(True, description="Debug mode flag")
@@ -4,7 +4,7 @@ from uuid import UUID, uuid4
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
-from .player import Player
+from .player import Player, PlayerStatus
 from .actions import ChatMessage
 
 
@@ -47,6 +47,18 @@ class GameState(BaseModel):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.history.append(f"[{timestamp}] {event}")
         self.updated_at = datetime.now()
+
+    def living_players(self) -> List[Player]:
+        """Get the players who are still alive, in player order."""
+        return [p for p in self.players if p.status == PlayerStatus.ALIVE]
+
+    def alive_except(self, player_id: UUID) -> List[Player]:
+        """Get the living players other than the given one (e.g. an AI's night targets)."""
+        return [p for p in self.players if p.status == PlayerStatus.ALIVE and p.id != player_id]
+
+    def living_allies(self, player: Player) -> List[Player]:
+        """Get the other living players who share the given player's role (e.g. Mafia allies)."""
+        return [p for p in self.players if p.role == player.role and p.id != player.id and p.status == PlayerStatus.ALIVE]
     
     @model_serializer
     def serialize_model(self) -> dict:
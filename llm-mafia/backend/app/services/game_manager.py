@@ -13,6 +13,7 @@ from ..models import (
     AIPersona,  # Assuming personas might be assigned here later
 )
 from . import state_service
+from .. import dependencies # Module import, so patches of dependencies.get_websocket_manager apply
 
 # Basic Persona IDs for now - replace with actual loading/generation later
 DEFAULT_PERSONA_IDS = ["persona_logical", "persona_quiet", "persona_aggressive"]
@@ -144,8 +145,7 @@ class GameManager:
             print(f"Game {game_id_str} updated and saved.") # Logging
 
             # Broadcast the updated state
-            from ..dependencies import get_websocket_manager # Import getter
-            websocket_manager = get_websocket_manager() # Get the instance
+            websocket_manager = dependencies.get_websocket_manager() # Get the instance
             await websocket_manager.broadcast_to_game(game_id_str, new_state)
             print(f"Game {game_id_str} update broadcasted.") # Logging
 
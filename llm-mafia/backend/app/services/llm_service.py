@@ -1,13 +1,13 @@
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 from openai import OpenAI, OpenAIError
-import json
+import orjson # Faster than json.loads for the short JSON responses
 import random # Added for fallback logic
 
 from ..core.config import settings, LLMProvider
 from ..models.game import GameState
-from ..models.player import Player, Role, PlayerStatus
+from ..models.player import Player, Role
 from ..models.actions import (
     BaseAction, MafiaKillAction, DoctorProtectAction, DetectiveInvestigateAction,
     ChatMessage, ActionType
@@ -15,6 +15,98 @@ from ..models.actions import (
 
 logger = logging.getLogger(__name__)
 
+# Role-specific text and the fixed instructions of the night, day and voting prompts are
+# formatted into per-role templates once at import; only the game-state fields
+# (player IDs, lists, history) are filled in per call.
+_NIGHT_ROLE_DESCRIPTIONS: Dict[Role, str] = {
+    Role.MAFIA: "You are a Mafia member. Your goal is to eliminate all Innocents. Choose one living player to kill tonight. Do not target yourself or other Mafia members (if known).",
+    Role.DETECTIVE: "You are the Detective. Your goal is to identify Mafia members. Choose one living player to investigate tonight. You will learn if they are Mafia or Innocent.",
+    Role.DOCTOR: "You are the Doctor. Your goal is to protect Innocents. Choose one living player to save tonight. If the Mafia targets them, your save will succeed. Consider protecting likely targets or yourself.",
+    Role.VILLAGER: "You are a Villager. You have no special night action."
+}
+
+_NIGHT_PROMPT_TEMPLATES: Dict[Role, str] = {
+    role: """You are Player {player_id}, an AI playing Mafia.
+Your Role: %s
+Your Objective: %s
+
+Game State:
+Current Phase: Night {day_number}
+Living Players: {living_count}
+
+Player List:
+{player_list}
+
+{history_summary}
+
+Available Living Targets for Your Action:
+{target_list}
+
+Task: Decide your night action. Choose one player ID from the 'Available Living Targets' list.
+Respond ONLY with a JSON object containing the key 'target_player_id' and the chosen player ID as the value. Example: {{"target_player_id": "player_uuid_here"}}""" % (role.value, description)
+    for role, description in _NIGHT_ROLE_DESCRIPTIONS.items()
+}
+
+_DAY_ROLE_GOALS: Dict[Role, str] = {
+    Role.MAFIA: "Your goal is to eliminate Innocents and avoid suspicion. Try to accuse others plausibly, deflect blame, or stay quiet.",
+    Role.DETECTIVE: "Your goal is to identify Mafia. Use your investigation results subtly to guide Innocents or cast suspicion. Avoid revealing your role directly unless necessary.",
+    Role.DOCTOR: "Your goal is to help Innocents win. Observe behavior and contribute to identifying Mafia. You might have saved someone last night.",
+    Role.VILLAGER: "Your goal is to identify and lynch Mafia members. Discuss suspicions, ask questions, and analyze others' behavior."
+}
+
+_DAY_PROMPT_TEMPLATES: Dict[Role, str] = {
+    role: """You are Player {player_id}, an AI playing Mafia.
+Your Role: %s
+%s{private_info}
+
+Game State:
+Current Phase: Day {day_number} Discussion
+Living Players: {living_count}
+
+Player List:
+{player_list}
+
+{history_summary}
+
+{chat_summary}
+
+Task: Generate a single, concise chat message (1-2 sentences) appropriate for the current discussion. Contribute to the conversation, express suspicion, defend yourself, or ask questions based on your role and the game state. Do not reveal your specific role unless strategically beneficial (rarely). Avoid overly generic statements.
+
+Respond ONLY with a JSON object containing the key 'chat_message' and your message as a string value. Example: {{"chat_message": "I'm not sure about Player X, they seemed quiet last night."}}""" % (role.value, goal)
+    for role, goal in _DAY_ROLE_GOALS.items()
+}
+
+_VOTING_ROLE_GOALS: Dict[Role, str] = {
+    Role.MAFIA: "Your goal is to eliminate Innocents. Vote strategically to lynch an Innocent, preferably someone suspicious or who suspects you. Coordinate votes with allies if possible (though direct coordination isn't simulated here). Avoid voting for fellow Mafia.",
+    Role.DETECTIVE: "Your goal is to identify Mafia. Use your investigation results and observations from discussion to vote for a likely Mafia member. Try to lead other Innocents.",
+    Role.DOCTOR: "Your goal is to help Innocents win. Vote based on suspicions developed during discussion. Protect Innocents.",
+    Role.VILLAGER: "Your goal is to identify and lynch Mafia members. Vote based on discussion, behavior, and any evidence presented."
+}
+
+_VOTING_PROMPT_TEMPLATES: Dict[Role, str] = {
+    role: """You are Player {player_id}, an AI playing Mafia.
+Your Role: %s
+%s{private_info}
+
+Game State:
+Current Phase: Day {day_number} Voting
+Living Players: {living_count}
+
+Player List:
+{player_list}
+
+{history_summary}
+
+{chat_summary}
+
+Available Players to Vote For:
+{target_list}
+
+Task: Decide who to vote for to lynch. Consider the discussion, your role's goal, and any private information. Choose one player ID from the 'Available Players to Vote For' list.
+Respond ONLY with a JSON object containing the key 'voted_player_id' and the chosen player ID as the value. Example: {{"voted_player_id": "player_uuid_here"}}""" % (role.value, goal)
+    for role, goal in _VOTING_ROLE_GOALS.items()
+}
+
 class LLMServiceError(Exception):
     '''Custom exception for LLM service errors.'''
     pass
@@ -28,7 +120,8 @@ class LLMService:
         if self.provider == LLMProvider.OPENAI:
             api_key = settings.OPENAI_API_KEY
             if api_key:
-                self.client = OpenAI(api_key=api_key)
+                # The client retries transient failures itself, backing off exponentially with jitter
+                self.client = OpenAI(api_key=api_key, max_retries=settings.OPENAI_MAX_RETRIES)
             else:
                 logger.warning("OpenAI API key not found. LLMService will not function.")
         # TODO: Add initialization for other providers (Google, Anthropic)
@@ -42,27 +135,44 @@ class LLMService:
         if not self.client:
             logger.error(f"Failed to initialize LLM client for provider: {self.provider}")
 
+    def _stream_json_completion(self, **request: Any) -> str:
+        """
+        Streams an OpenAI chat completion and returns its text as soon as it holds a complete
+        JSON object, closing the stream instead of waiting for the provider to finish it.
+        Text that never parses is returned whole, so callers still report the decode error.
+        """
+        stream = self.client.chat.completions.create(stream=True, **request)
+        content = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices: # e.g. a trailing usage-only chunk
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                content += delta
+                if "}" in delta:
+                    try:
+                        orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        continue # Brace inside a string value, or more objects still to come
+                    break
+        finally:
+            stream.close()
+        return content
+
     def _generate_night_action_prompt(self, ai_player: Player, game_state: GameState) -> str:
         '''Generates a detailed prompt for the LLM based on the game state and AI player's role for NIGHT ACTIONS.'''
 
-        living_players = [p for p in game_state.players if p.status == PlayerStatus.ALIVE]
+        living_players = game_state.living_players()
         player_list_str = "\n".join([f"- Player {p.id}: Status {p.status.value}" + (f" (You, Role: {ai_player.role.value})" if p.id == ai_player.id else "") for p in game_state.players])
         
         # Simplified history for now - enhance later with memory
         history_summary = "Game History Summary:\n" + "\n".join(game_state.history) if game_state.history else "No significant events yet."
 
-        role_description = {
-            Role.MAFIA: "You are a Mafia member. Your goal is to eliminate all Innocents. Choose one living player to kill tonight. Do not target yourself or other Mafia members (if known).",
-            Role.DETECTIVE: "You are the Detective. Your goal is to identify Mafia members. Choose one living player to investigate tonight. You will learn if they are Mafia or Innocent.",
-            Role.DOCTOR: "You are the Doctor. Your goal is to protect Innocents. Choose one living player to save tonight. If the Mafia targets them, your save will succeed. Consider protecting likely targets or yourself.",
-            Role.VILLAGER: "You are a Villager. You have no special night action."
-        }.get(ai_player.role, "Unknown role.")
-
         if ai_player.role == Role.VILLAGER:
             return "" # Villagers don't act at night
 
         # Identify potential targets (living players excluding self, maybe allies for Mafia)
-        potential_targets = [p for p in living_players if p.id != ai_player.id]
+        potential_targets = game_state.alive_except(ai_player.id)
         if ai_player.role == Role.MAFIA:
             # TODO: Incorporate knowledge of other Mafia members
             pass 
@@ -73,27 +183,14 @@ class LLMService:
 
         target_list_str = "\n".join([f"- Player {p.id}" for p in potential_targets])
 
-        prompt = f"""
-You are Player {ai_player.id}, an AI playing Mafia.
-Your Role: {ai_player.role.value}
-Your Objective: {role_description}
-
-Game State:
-Current Phase: Night {game_state.day_number}
-Living Players: {len(living_players)}
-
-Player List:
-{player_list_str}
-
-{history_summary}
-
-Available Living Targets for Your Action:
-{target_list_str}
-
-Task: Decide your night action. Choose one player ID from the 'Available Living Targets' list.
-Respond ONLY with a JSON object containing the key 'target_player_id' and the chosen player ID as the value. Example: {{"target_player_id": "player_uuid_here"}}
-"""
-        return prompt.strip()
+        return _NIGHT_PROMPT_TEMPLATES[ai_player.role].format(
+            player_id=ai_player.id,
+            day_number=game_state.day_number,
+            living_count=len(living_players),
+            player_list=player_list_str,
+            history_summary=history_summary,
+            target_list=target_list_str,
+        )
 
     def determine_ai_night_action(self, ai_player: Player, game_state: GameState) -> Optional[BaseAction]:
         '''Uses the LLM to determine the night action for an AI player.'''
@@ -110,7 +207,7 @@ Respond ONLY with a JSON object containing the key 'target_player_id' and the ch
         try:
             if self.provider == LLMProvider.OPENAI:
                 # Using chat completions endpoint
-                response = self.client.chat.completions.create(
+                response_content = self._stream_json_completion(
                     model="gpt-3.5-turbo-0125", # Or configure via settings
                     messages=[
                         {"role": "system", "content": "You are an AI player in a game of Mafia."},
@@ -120,21 +217,22 @@ Respond ONLY with a JSON object containing the key 'target_player_id' and the ch
                     max_tokens=50, # Should be enough for just the JSON
                     response_format={"type": "json_object"} # Request JSON output
                 )
-                response_content = response.choices[0].message.content
                 logger.debug(f"LLM raw response for Player {ai_player.id}: {response_content}")
 
                 if not response_content:
                     raise LLMServiceError("LLM returned empty content.")
 
                 # Parse the JSON response
-                action_data = json.loads(response_content)
+                action_data = orjson.loads(response_content)
                 target_player_id_str = action_data.get('target_player_id')
 
                 if not target_player_id_str:
                     raise LLMServiceError(f"LLM response missing 'target_player_id'. Response: {response_content}")
 
                 # Validate target_player_id
-                valid_target_ids = {p.id for p in game_state.players if p.status == PlayerStatus.ALIVE and p.id != ai_player.id}
+                # A tuple in player order: membership checks are as cheap as a set's for a game-sized
+                # list, and the fallback can pick from it directly without building a list.
+                valid_target_ids = tuple(p.id for p in game_state.alive_except(ai_player.id))
                 # TODO: Add Mafia ally check if needed
                 
                 target_player_uuid: Optional[UUID] = None
@@ -153,7 +251,7 @@ Respond ONLY with a JSON object containing the key 'target_player_id' and the ch
                 if target_player_uuid is None:
                     if not valid_target_ids: # Should not happen if prompt generation worked
                          raise LLMServiceError(f"No valid targets available for Player {ai_player.id} ({ai_player.role.value}) fallback.")
-                    target_player_uuid = random.choice(list(valid_target_ids))
+                    target_player_uuid = random.choice(valid_target_ids)
                     logger.info(f"Fallback chose target {target_player_uuid} for Player {ai_player.id}")
 
 
@@ -178,66 +276,49 @@ Respond ONLY with a JSON object containing the key 'target_player_id' and the ch
         except OpenAIError as e:
             logger.error(f"OpenAI API error for Player {ai_player.id}: {e}")
             raise LLMServiceError(f"OpenAI API error: {e}") from e
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
              logger.error(f"Failed to parse LLM JSON response for Player {ai_player.id}. Response: '{response_content}'. Error: {e}")
              raise LLMServiceError(f"Failed to parse LLM JSON response: {e}") from e
         except Exception as e:
             logger.error(f"Unexpected error during LLM action generation for Player {ai_player.id}: {e}")
             raise LLMServiceError(f"Unexpected error: {e}") from e
 
-    def _generate_day_discussion_prompt(self, ai_player: Player, game_state: GameState, recent_messages: List[ChatMessage]) -> str:
-        """Generates a prompt for the LLM for DAY discussion."""
-        living_players = [p for p in game_state.players if p.status == PlayerStatus.ALIVE]
-        player_list_str = "\n".join([f"- Player {p.id}: Status {p.status.value}" + (f" (You, Role: {ai_player.role.value})" if p.id == ai_player.id else "") for p in game_state.players])
-
-        # Get recent history/announcements
+    def _recent_context(self, game_state: GameState, recent_messages: List[ChatMessage], chat_limit: int) -> Tuple[str, str]:
+        """Builds the recent events and chat summaries shared by the day and voting prompts."""
         history_summary = "Recent Events/Announcements:\n" + "\n".join(game_state.history[-5:]) if game_state.history else "No recent events."
-
-        # Get recent chat messages
         chat_summary = "Recent Chat Messages:\n"
         if recent_messages:
-             chat_summary += "\n".join([f"- Player {msg.player_id}: {msg.message}" for msg in recent_messages[-10:]]) # Last 10 messages
+             chat_summary += "\n".join([f"- Player {msg.player_id}: {msg.message}" for msg in recent_messages[-chat_limit:]])
         else:
             chat_summary += "No recent chat messages."
+        return history_summary, chat_summary
+
+    def _generate_day_discussion_prompt(self, ai_player: Player, game_state: GameState, recent_messages: List[ChatMessage]) -> str:
+        """Generates a prompt for the LLM for DAY discussion."""
+        living_players = game_state.living_players()
+        player_list_str = "\n".join([f"- Player {p.id}: Status {p.status.value}" + (f" (You, Role: {ai_player.role.value})" if p.id == ai_player.id else "") for p in game_state.players])
 
-        # Role-specific goals/persona hints
-        role_goal = {
-            Role.MAFIA: "Your goal is to eliminate Innocents and avoid suspicion. Try to accuse others plausibly, deflect blame, or stay quiet.",
-            Role.DETECTIVE: "Your goal is to identify Mafia. Use your investigation results subtly to guide Innocents or cast suspicion. Avoid revealing your role directly unless necessary.",
-            Role.DOCTOR: "Your goal is to help Innocents win. Observe behavior and contribute to identifying Mafia. You might have saved someone last night.",
-            Role.VILLAGER: "Your goal is to identify and lynch Mafia members. Discuss suspicions, ask questions, and analyze others' behavior."
-        }.get(ai_player.role, "Your goal is to help your faction win.")
+        # Get recent history/announcements and chat messages (last 10)
+        history_summary, chat_summary = self._recent_context(game_state, recent_messages, 10)
 
         # Include private info if Detective
         private_info = ""
         if ai_player.role == Role.DETECTIVE and ai_player.investigation_result:
             private_info = f"\nYour Private Information: {ai_player.investigation_result}"
         elif ai_player.role == Role.MAFIA:
-            mafia_allies = [p.id for p in game_state.players if p.role == Role.MAFIA and p.id != ai_player.id and p.status == PlayerStatus.ALIVE]
+            mafia_allies = [p.id for p in game_state.living_allies(ai_player)]
             if mafia_allies:
                 private_info = f"\nYour Mafia Allies (DO NOT REVEAL): {', '.join(map(str, mafia_allies))}"
 
-        prompt = f"""
-You are Player {ai_player.id}, an AI playing Mafia.
-Your Role: {ai_player.role.value}
-{role_goal}{private_info}
-
-Game State:
-Current Phase: Day {game_state.day_number} Discussion
-Living Players: {len(living_players)}
-
-Player List:
-{player_list_str}
-
-{history_summary}
-
-{chat_summary}
-
-Task: Generate a single, concise chat message (1-2 sentences) appropriate for the current discussion. Contribute to the conversation, express suspicion, defend yourself, or ask questions based on your role and the game state. Do not reveal your specific role unless strategically beneficial (rarely). Avoid overly generic statements.
-
-Respond ONLY with a JSON object containing the key 'chat_message' and your message as a string value. Example: {{"chat_message": "I'm not sure about Player X, they seemed quiet last night."}}
-"""
-        return prompt.strip()
+        return _DAY_PROMPT_TEMPLATES[ai_player.role].format(
+            player_id=ai_player.id,
+            private_info=private_info,
+            day_number=game_state.day_number,
+            living_count=len(living_players),
+            player_list=player_list_str,
+            history_summary=history_summary,
+            chat_summary=chat_summary,
+        )
 
     def generate_ai_day_message(self, ai_player: Player, game_state: GameState) -> Optional[ChatMessage]:
         """Uses the LLM to generate a chat message for an AI player during the Day phase."""
@@ -254,7 +335,7 @@ Respond ONLY with a JSON object containing the key 'chat_message' and your messa
 
         try:
             if self.provider == LLMProvider.OPENAI:
-                response = self.client.chat.completions.create(
+                response_content = self._stream_json_completion(
                     model="gpt-3.5-turbo-0125", # Or configure via settings
                     messages=[
                         {"role": "system", "content": "You are an AI player in a game of Mafia, participating in the day discussion."},
@@ -264,14 +345,13 @@ Respond ONLY with a JSON object containing the key 'chat_message' and your messa
                     max_tokens=100, # Allow longer messages than night actions
                     response_format={"type": "json_object"} # Request JSON output
                 )
-                response_content = response.choices[0].message.content
                 logger.debug(f"LLM raw response for Player {ai_player.id} day message: {response_content}")
 
                 if not response_content:
                     raise LLMServiceError("LLM returned empty content for day message.")
 
                 # Parse the JSON response
-                message_data = json.loads(response_content)
+                message_data = orjson.loads(response_content)
                 message_text = message_data.get('chat_message')
 
                 if not message_text or not message_text.strip():
@@ -290,7 +370,7 @@ Respond ONLY with a JSON object containing the key 'chat_message' and your messa
         except OpenAIError as e:
             logger.error(f"OpenAI API error during day message generation for Player {ai_player.id}: {e}")
             raise LLMServiceError(f"OpenAI API error: {e}") from e
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
              logger.error(f"Failed to parse LLM JSON response for Player {ai_player.id} day message. Response: '{response_content}'. Error: {e}")
              raise LLMServiceError(f"Failed to parse LLM JSON response: {e}") from e
         except Exception as e:
@@ -299,47 +379,27 @@ Respond ONLY with a JSON object containing the key 'chat_message' and your messa
 
     def _generate_voting_prompt(self, ai_player: Player, game_state: GameState) -> str:
         """Generates a prompt for the LLM to decide who to VOTE for."""
-        living_players = [p for p in game_state.players if p.status == PlayerStatus.ALIVE]
+        living_players = game_state.living_players()
         player_list_str = "\n".join([f"- Player {p.id}: Status {p.status.value}" + (f" (You, Role: {ai_player.role.value})" if p.id == ai_player.id else "") for p in game_state.players])
 
-        # History and Chat
-        history_summary = "Recent Events/Announcements:\n" + "\n".join(game_state.history[-5:]) if game_state.history else "No recent events."
-        chat_summary = "Recent Chat Messages:\n"
-        recent_chats = game_state.chat_history # Use the new field
-        if recent_chats:
-             chat_summary += "\n".join([f"- Player {msg.player_id}: {msg.message}" for msg in recent_chats[-15:]]) # Last 15 messages for voting context
-        else:
-            chat_summary += "No recent chat messages."
-
-        # Role-specific voting goal
-        role_goal = {
-            Role.MAFIA: "Your goal is to eliminate Innocents. Vote strategically to lynch an Innocent, preferably someone suspicious or who suspects you. Coordinate votes with allies if possible (though direct coordination isn't simulated here). Avoid voting for fellow Mafia.",
-            Role.DETECTIVE: "Your goal is to identify Mafia. Use your investigation results and observations from discussion to vote for a likely Mafia member. Try to lead other Innocents.",
-            Role.DOCTOR: "Your goal is to help Innocents win. Vote based on suspicions developed during discussion. Protect Innocents.",
-            Role.VILLAGER: "Your goal is to identify and lynch Mafia members. Vote based on discussion, behavior, and any evidence presented."
-        }.get(ai_player.role, "Your goal is to help your faction win.")
+        # History and Chat (last 15 messages for voting context)
+        history_summary, chat_summary = self._recent_context(game_state, game_state.chat_history, 15)
 
         # Private info
+        mafia_allies = game_state.living_allies(ai_player) if ai_player.role == Role.MAFIA else []
         private_info = ""
         if ai_player.role == Role.DETECTIVE and ai_player.investigation_result:
             private_info = f"\nYour Private Information: {ai_player.investigation_result}"
-        elif ai_player.role == Role.MAFIA:
-            mafia_allies = [p for p in game_state.players if p.role == Role.MAFIA and p.id != ai_player.id and p.status == PlayerStatus.ALIVE]
-            if mafia_allies:
-                private_info = f"\nYour Mafia Allies (DO NOT VOTE FOR THEM): {', '.join([str(ally.id) for ally in mafia_allies])}"
+        elif mafia_allies:
+            private_info = f"\nYour Mafia Allies (DO NOT VOTE FOR THEM): {', '.join([str(ally.id) for ally in mafia_allies])}"
 
         # Valid voting targets (living players, usually including self, but depends on rules - let's allow self-vote)
         # Mafia should ideally not vote for other Mafia
-        potential_targets = [p for p in living_players] # Default: all living players
-        mafia_allies_ids = set()
-        if ai_player.role == Role.MAFIA:
-             # Find allies correctly
-             mafia_allies = [p for p in game_state.players if p.role == Role.MAFIA and p.id != ai_player.id and p.status == PlayerStatus.ALIVE]
-             if mafia_allies:
-                 mafia_allies_ids = {ally.id for ally in mafia_allies}
-                 private_info = f"\nYour Mafia Allies (DO NOT VOTE FOR THEM): {', '.join([str(ally.id) for ally in mafia_allies])}"
-                 # Filter directly from living_players based on the ally IDs set
-                 potential_targets = [p for p in living_players if p.id not in mafia_allies_ids]
+        potential_targets = list(living_players) # Default: all living players
+        if mafia_allies:
+            mafia_allies_ids = {ally.id for ally in mafia_allies}
+            # Filter directly from living_players based on the ally IDs set
+            potential_targets = [p for p in living_players if p.id not in mafia_allies_ids]
 
         if not potential_targets:
              # If filtering left no one (e.g., only Mafia left), fall back to all living players
@@ -356,29 +416,16 @@ Respond ONLY with a JSON object containing the key 'chat_message' and your messa
 
         target_list_str = "\n".join([f"- Player {p.id}" for p in potential_targets])
 
-        prompt = f"""
-You are Player {ai_player.id}, an AI playing Mafia.
-Your Role: {ai_player.role.value}
-{role_goal}{private_info}
-
-Game State:
-Current Phase: Day {game_state.day_number} Voting
-Living Players: {len(living_players)}
-
-Player List:
-{player_list_str}
-
-{history_summary}
-
-{chat_summary}
-
-Available Players to Vote For:
-{target_list_str}
-
-Task: Decide who to vote for to lynch. Consider the discussion, your role's goal, and any private information. Choose one player ID from the 'Available Players to Vote For' list.
-Respond ONLY with a JSON object containing the key 'voted_player_id' and the chosen player ID as the value. Example: {{"voted_player_id": "player_uuid_here"}}
-"""
-        return prompt.strip()
+        return _VOTING_PROMPT_TEMPLATES[ai_player.role].format(
+            player_id=ai_player.id,
+            private_info=private_info,
+            day_number=game_state.day_number,
+            living_count=len(living_players),
+            player_list=player_list_str,
+            history_summary=history_summary,
+            chat_summary=chat_summary,
+            target_list=target_list_str,
+        )
 
     def determine_ai_vote(self, ai_player: Player, game_state: GameState) -> Optional[UUID]:
         """Uses the LLM to determine which player an AI agent should vote for."""
@@ -395,7 +442,7 @@ Respond ONLY with a JSON object containing the key 'voted_player_id' and the cho
 
         try:
             if self.provider == LLMProvider.OPENAI:
-                response = self.client.chat.completions.create(
+                response_content = self._stream_json_completion(
                     model="gpt-3.5-turbo-0125",
                     messages=[
                         {"role": "system", "content": "You are an AI player in a game of Mafia, currently deciding who to vote for."},
@@ -405,29 +452,24 @@ Respond ONLY with a JSON object containing the key 'voted_player_id' and the cho
                     max_tokens=50,
                     response_format={"type": "json_object"}
                 )
-                response_content = response.choices[0].message.content
                 logger.debug(f"LLM raw response for Player {ai_player.id} Vote: {response_content}")
 
                 if not response_content:
                     raise LLMServiceError("LLM returned empty content for vote.")
 
-                vote_data = json.loads(response_content)
+                vote_data = orjson.loads(response_content)
                 voted_player_id_str = vote_data.get('voted_player_id')
 
                 if not voted_player_id_str:
                     raise LLMServiceError(f"LLM response missing 'voted_player_id'. Response: {response_content}")
 
                 # Validate voted_player_id
-                living_player_ids = {p.id for p in game_state.players if p.status == PlayerStatus.ALIVE}
+                living_player_ids = tuple(p.id for p in game_state.living_players()) # Player order, see determine_ai_night_action
                 # Define stricter valid targets based on prompt generation logic if possible
-                valid_target_ids = set()
-                living_players = [p for p in game_state.players if p.status == PlayerStatus.ALIVE]
-                mafia_allies_ids = set() # Define outside the if block
+                valid_target_ids = living_player_ids
                 if ai_player.role == Role.MAFIA:
-                    mafia_allies_ids = {p.id for p in game_state.players if p.role == Role.MAFIA and p.id != ai_player.id and p.status == PlayerStatus.ALIVE}
-                    valid_target_ids = {p.id for p in living_players if p.id not in mafia_allies_ids}
-                else:
-                    valid_target_ids = {p.id for p in living_players} # Correctly get all living IDs
+                    ally_ids = {p.id for p in game_state.living_allies(ai_player)}
+                    valid_target_ids = tuple(pid for pid in living_player_ids if pid not in ally_ids)
                 
                 if not valid_target_ids and living_player_ids: # Fallback if exclusion left no targets but players exist
                     logger.warning(f"Mafia {ai_player.id} exclusion logic resulted in no valid targets. Allowing vote for any living player.")
@@ -451,7 +493,7 @@ Respond ONLY with a JSON object containing the key 'voted_player_id' and the cho
                     if not valid_target_ids:
                         logger.error(f"No valid targets available for Player {ai_player.id} ({ai_player.role.value}) vote fallback.")
                         return None # Cannot determine vote
-                    voted_player_uuid = random.choice(list(valid_target_ids))
+                    voted_player_uuid = random.choice(valid_target_ids)
                     logger.info(f"Fallback chose vote target {voted_player_uuid} for Player {ai_player.id}")
                 
                 return voted_player_uuid # Return the chosen player's UUID
@@ -464,7 +506,7 @@ Respond ONLY with a JSON object containing the key 'voted_player_id' and the cho
         except OpenAIError as e:
             logger.error(f"OpenAI API error determining vote for Player {ai_player.id}: {e}")
             raise LLMServiceError(f"OpenAI API error: {e}") from e
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM JSON response for vote for Player {ai_player.id}. Response: '{response_content}'. Error: {e}")
             raise LLMServiceError(f"Failed to parse LLM JSON response: {e}") from e
         except Exception as e:
@@ -71,8 +71,9 @@ def _resolve_night_actions(game_state: GameState) -> Tuple[Optional[Player], Opt
     announcements: List[str] = []
 
     # Helper to find player by ID
+    players_by_id: Dict[UUID, Player] = {p.id: p for p in game_state.players}
     def get_player(player_id: UUID) -> Optional[Player]:
-        return next((p for p in game_state.players if p.id == player_id), None)
+        return players_by_id.get(player_id)
 
     # Identify actions by type
     mafia_action: Optional[MafiaKillAction] = None
@@ -160,6 +161,19 @@ def _resolve_night_actions(game_state: GameState) -> Tuple[Optional[Player], Opt
     return killed_player, saved_player, announcements
 
 
+async def _gather_ai_calls(llm_call, players: List[Player], game_state: GameState) -> list:
+    """
+    Runs a blocking llm_service call for each player concurrently in worker threads.
+    Each call is dominated by the OpenAI round-trip, so the phase waits for the slowest
+    call instead of the sum of all of them. Results (or the exception raised) are
+    returned in player order.
+    """
+    return await asyncio.gather(
+        *(asyncio.to_thread(llm_call, player, game_state) for player in players),
+        return_exceptions=True,
+    )
+
+
 async def advance_to_night(game_state: GameState, game_id: str) -> GameState:
     """Advances the game state to the Night phase and triggers AI night actions."""
     if game_state.phase == GamePhase.DAY or game_state.phase == GamePhase.VOTING:
@@ -176,28 +190,31 @@ async def advance_to_night(game_state: GameState, game_id: str) -> GameState:
     await game_manager.update_game_state(game_id, game_state) # Save and broadcast
 
     # Trigger AI Night Actions (Step 10)
-    for player in game_state.players:
-        if not player.is_human and player.status == PlayerStatus.ALIVE and player.role in [Role.MAFIA, Role.DOCTOR, Role.DETECTIVE]:
+    # The LLM calls run concurrently; results are recorded afterwards in player order.
+    night_actors = [
+        player for player in game_state.players
+        if not player.is_human and player.status == PlayerStatus.ALIVE and player.role in [Role.MAFIA, Role.DOCTOR, Role.DETECTIVE]
+    ]
+    results = await _gather_ai_calls(llm_service.determine_ai_night_action, night_actors, game_state)
+    for player, ai_action in zip(night_actors, results):
+        if isinstance(ai_action, LLMServiceError):
+            game_state.add_to_history(f"AI {player.role.value} ({player.id}) failed to determine action due to LLM error: {ai_action}")
+            # logger.error(f"LLM Service Error for AI {player.id}: {ai_action}") # Log error using logger
+            print(f"LLM Service Error for AI {player.id}: {ai_action}")
+        elif isinstance(ai_action, Exception):
+            game_state.add_to_history(f"Unexpected error determining action for AI {player.role.value} ({player.id}): {ai_action}")
+            # logger.exception(f"Unexpected Error for AI {player.id}") # Log error with stack trace
+            print(f"Unexpected Error for AI {player.id}: {ai_action}")
+        elif ai_action:
             try:
-                ai_action = llm_service.determine_ai_night_action(player, game_state)
-                if ai_action:
-                    try:
-                        # Use action_service to record the action, which updates game_state.night_actions
-                        action_service.record_night_action(game_state, ai_action)
-                        game_state.add_to_history(f"AI {player.role.value} ({player.id}) has decided their action.") # Log internal decision
-                        # NOTE: Do not save state after every single AI action. Save once after all AI actions or rely on next phase transition save.
-                    except ActionValidationError as ave:
-                        game_state.add_to_history(f"AI {player.role.value} ({player.id}) failed to record action: {ave}")
-                        # logger.warning(f"Validation Error for AI {player.id}: {ave}") # Log error using logger
-                        print(f"Validation Error for AI {player.id}: {ave}")
-            except LLMServiceError as llme:
-                game_state.add_to_history(f"AI {player.role.value} ({player.id}) failed to determine action due to LLM error: {llme}")
-                # logger.error(f"LLM Service Error for AI {player.id}: {llme}") # Log error using logger
-                print(f"LLM Service Error for AI {player.id}: {llme}")
-            except Exception as e:
-                game_state.add_to_history(f"Unexpected error determining action for AI {player.role.value} ({player.id}): {e}")
-                # logger.exception(f"Unexpected Error for AI {player.id}") # Log error with stack trace
-                print(f"Unexpected Error for AI {player.id}: {e}")
+                # Use action_service to record the action, which updates game_state.night_actions
+                action_service.record_night_action(game_state, ai_action)
+                game_state.add_to_history(f"AI {player.role.value} ({player.id}) has decided their action.") # Log internal decision
+                # NOTE: Do not save state after every single AI action. Save once after all AI actions or rely on next phase transition save.
+            except ActionValidationError as ave:
+                game_state.add_to_history(f"AI {player.role.value} ({player.id}) failed to record action: {ave}")
+                # logger.warning(f"Validation Error for AI {player.id}: {ave}") # Log error using logger
+                print(f"Validation Error for AI {player.id}: {ave}")
 
     # Save state again *after* all potential AI actions are recorded
     # save_game_state(game_id, game_state)
@@ -234,23 +251,23 @@ async def advance_to_day(game_state: GameState, game_id: str) -> GameState:
     await game_manager.update_game_state(game_id, game_state) # Save and broadcast start of day state
 
     # 4. Trigger AI Discussion (Step 11)
+    # Every AI sees the same chat history, so the messages are generated concurrently.
+    ai_speakers = [player for player in game_state.players if not player.is_human and player.status == PlayerStatus.ALIVE]
+    results = await _gather_ai_calls(llm_service.generate_ai_day_message, ai_speakers, game_state)
     ai_messages: List[ChatMessage] = []
-    for player in game_state.players:
-        if not player.is_human and player.status == PlayerStatus.ALIVE:
-            try:
-                ai_message = llm_service.generate_ai_day_message(player, game_state)
-                if ai_message:
-                    ai_messages.append(ai_message)
-                    # Optionally add to history immediately, or just collect
-                    # game_state.add_to_history(f"AI {player.name} ({player.id}) says: {ai_message.message}") 
-            except LLMServiceError as llme:
-                game_state.add_to_history(f"AI {player.name} ({player.id}) failed to generate message due to LLM error: {llme}")
-                # logger.error(f"LLM Service Error for AI {player.id} Day Msg: {llme}") # Log error
-                print(f"LLM Service Error for AI {player.id} Day Msg: {llme}")
-            except Exception as e:
-                game_state.add_to_history(f"Unexpected error generating message for AI {player.name} ({player.id}): {e}")
-                # logger.exception(f"Unexpected Error for AI {player.id} Day Msg") # Log error with stack trace
-                print(f"Unexpected Error for AI {player.id} Day Msg: {e}")
+    for player, ai_message in zip(ai_speakers, results):
+        if isinstance(ai_message, LLMServiceError):
+            game_state.add_to_history(f"AI {player.name} ({player.id}) failed to generate message due to LLM error: {ai_message}")
+            # logger.error(f"LLM Service Error for AI {player.id} Day Msg: {ai_message}") # Log error
+            print(f"LLM Service Error for AI {player.id} Day Msg: {ai_message}")
+        elif isinstance(ai_message, Exception):
+            game_state.add_to_history(f"Unexpected error generating message for AI {player.name} ({player.id}): {ai_message}")
+            # logger.exception(f"Unexpected Error for AI {player.id} Day Msg") # Log error with stack trace
+            print(f"Unexpected Error for AI {player.id} Day Msg: {ai_message}")
+        elif ai_message:
+            ai_messages.append(ai_message)
+            # Optionally add to history immediately, or just collect
+            # game_state.add_to_history(f"AI {player.name} ({player.id}) says: {ai_message.message}") 
                 
     # Add all generated AI messages to chat history
     # Consider randomizing order later if needed
@@ -321,19 +338,22 @@ async def process_voting_and_advance(game_state: GameState, game_id: str, votes:
 
     # Tally Votes
     vote_counts: Dict[UUID, int] = {}
-    valid_voters = {p.id for p in game_state.players if p.status == PlayerStatus.ALIVE}
-    living_player_ids = {p.id for p in game_state.players if p.status == PlayerStatus.ALIVE}
+    # Index players by UUID once, rather than scanning the player list for every vote
+    players_by_id: Dict[UUID, Player] = {p.id: p for p in game_state.players}
+    living_player_ids = {p.id for p in game_state.living_players()} # Living players are the valid voters and targets
+
+    def player_name(player_id: UUID) -> str:
+        player = players_by_id.get(player_id)
+        return player.name if player else "Unknown"
 
     for voter_id, target_id in game_state.votes.items():
         # Ensure voter is alive and target is valid (and alive)
-        if voter_id in valid_voters and target_id in living_player_ids:
+        if voter_id in living_player_ids and target_id in living_player_ids:
             vote_counts[target_id] = vote_counts.get(target_id, 0) + 1
             # Log individual votes for history/transparency
-            voter_name = next((p.name for p in game_state.players if p.id == voter_id), "Unknown")
-            target_name = next((p.name for p in game_state.players if p.id == target_id), "Unknown")
-            game_state.add_to_history(f"{voter_name} voted for {target_name}.")
-        elif voter_id in valid_voters:
-             voter_name = next((p.name for p in game_state.players if p.id == voter_id), "Unknown")
+            game_state.add_to_history(f"{player_name(voter_id)} voted for {player_name(target_id)}.")
+        elif voter_id in living_player_ids:
+             voter_name = player_name(voter_id)
              game_state.add_to_history(f"{voter_name}'s vote for {target_id} was invalid (target not alive or invalid ID). ")
 
     # Determine Lynched Player
@@ -345,7 +365,7 @@ async def process_voting_and_advance(game_state: GameState, game_id: str, votes:
         if len(potential_lynches) == 1:
             # Clear winner
             lynched_player_id = potential_lynches[0]
-            lynched_player = next((p for p in game_state.players if p.id == lynched_player_id), None)
+            lynched_player = players_by_id.get(lynched_player_id)
             if lynched_player:
                 lynched_player.status = PlayerStatus.DEAD
                 game_state.add_to_history(
@@ -357,7 +377,7 @@ async def process_voting_and_advance(game_state: GameState, game_id: str, votes:
                 game_state.add_to_history("Error: Lynched player ID not found.")
         else:
             # Tie
-            tied_names = [next((p.name for p in game_state.players if p.id == pid), "Unknown") for pid in potential_lynches]
+            tied_names = [player_name(pid) for pid in potential_lynches]
             game_state.add_to_history(f"Voting resulted in a tie between: {', '.join(tied_names)}. No one is lynched.")
     else:
         game_state.add_to_history("No valid votes were cast. No one is lynched.")
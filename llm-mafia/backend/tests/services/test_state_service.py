@@ -6,12 +6,6 @@ import shutil
 from unittest.mock import patch
 import uuid
 
-# Adjust the path to import from the app directory
-# This assumes tests/ is parallel to app/ inside backend/
-import sys
-APP_PATH = Path(__file__).resolve().parent.parent.parent / 'app'
-sys.path.insert(0, str(APP_PATH.parent)) # Add backend/ to sys.path
-
 from app.models.game import GameState, GamePhase
 from app.models.player import Player, Role, PlayerStatus
 from app.models.settings import GameSettings
@@ -1,22 +1,8 @@
+import functools
 import pytest
 from unittest.mock import patch, MagicMock, call, AsyncMock
-import sys
-import os
 from uuid import UUID, uuid4
 
-# --- Path Hack --- 
-# Add the backend directory to sys.path to allow relative imports
-# Get the absolute path of the current test file
-test_file_path = os.path.abspath(__file__)
-# Get the directory containing the test file (tests/)
-test_dir = os.path.dirname(test_file_path)
-# Get the directory containing the tests directory (backend/)
-backend_dir = os.path.dirname(test_dir)
-# Add backend directory to sys.path if not already present
-if backend_dir not in sys.path:
-    sys.path.insert(0, backend_dir)
-# --- End Path Hack ---
-
 
 # Revert to relative imports
 from app.services.game_manager import GameManager
@@ -28,40 +14,64 @@ from app.models import (
     PlayerStatus,
     GamePhase,
 )
-# Import WebSocketManager for mocking
-from app.services.websocket_manager import WebSocketManager
 
 # --- Fixtures ---
 
-@pytest.fixture
-def mock_state_service():
-    """Mocks the state_service module."""
-    # Patch within the game_manager module where it's imported
-    with patch('app.services.game_manager.state_service', autospec=True) as mock_service:
+@pytest.fixture(scope="module")
+def _state_service_patch():
+    """Mocks the state_service module once for the whole module."""
+    # Patch within the game_manager module where it's imported. No autospec: only the
+    # three functions below are asserted on, and autospec introspects the whole module.
+    with patch('app.services.game_manager.state_service') as mock_service:
         mock_service.save_game_state = MagicMock()
-        mock_service.load_game_state = MagicMock(return_value=None)
+        mock_service.load_game_state = MagicMock()
         mock_service.delete_game_state = MagicMock()
         yield mock_service
 
+@pytest.fixture
+def mock_state_service(_state_service_patch):
+    """The module-wide state_service mock, reset to its defaults for each test."""
+    _state_service_patch.reset_mock(return_value=True, side_effect=True)
+    _state_service_patch.load_game_state.return_value = None
+    return _state_service_patch
+
 @pytest.fixture
 def mock_websocket_manager():
     """Mocks the get_websocket_manager function imported in game_manager."""
     # Patch the get_websocket_manager function in the dependencies module
     # because that's what game_manager.py calls.
     with patch('app.dependencies.get_websocket_manager') as mock_getter:
-        # Configure the mock getter to return an AsyncMock instance
-        mock_instance = AsyncMock(spec=WebSocketManager)
+        # Configure the mock getter to return an AsyncMock instance. No spec: only
+        # broadcast_to_game is used, and spec= introspects WebSocketManager per test.
+        mock_instance = AsyncMock()
         mock_instance.broadcast_to_game = AsyncMock() # Ensure the method is async
         mock_getter.return_value = mock_instance
         yield mock_instance # Yield the *mock instance* for tests to use
 
-@pytest.fixture
-def game_manager(mock_state_service, mock_websocket_manager): # Add mock_websocket_manager dependency
-    # GameManager itself doesn't need the mock injected at init,
-    # but the tests using it will benefit from the patch being active.
+@pytest.fixture(scope="module")
+def _game_manager_singleton(_state_service_patch):
+    """One GameManager for the module; its only per-test state is the active_games cache."""
     return GameManager()
 
 @pytest.fixture
+def game_manager(_game_manager_singleton, mock_state_service, mock_websocket_manager): # Add mock_websocket_manager dependency
+    # GameManager itself doesn't need the mocks injected at init,
+    # but the tests using it will benefit from the patches being active.
+    _game_manager_singleton.active_games.clear()
+    return _game_manager_singleton
+
+# Shared side_effect errors; GameManager catches and logs them, so one instance each is enough.
+_DISK_ERR = RuntimeError("Disk error")
+_WEBSOCKET_ERR = RuntimeError("WebSocket error")
+
+# Any well-formed game ID that is never cached or stored; tests only need it to miss.
+_UNCACHED_GAME_ID = str(uuid4())
+
+# Roles of the 7 sample players, in order; P1 is the human
+_SAMPLE_ROLES = (Role.MAFIA, Role.MAFIA, Role.DETECTIVE, Role.DOCTOR, Role.VILLAGER, Role.VILLAGER, Role.VILLAGER)
+
+# The sample settings are read-only in every test, so they are built once per module.
+@pytest.fixture(scope="module")
 def sample_game_settings():
     return GameSettings(
         id=uuid4(), # Ensure settings have an ID
@@ -69,29 +79,46 @@ def sample_game_settings():
         role_distribution={Role.MAFIA: 2, Role.DETECTIVE: 1, Role.DOCTOR: 1}
     )
 
-@pytest.fixture
-def sample_game_state(sample_game_settings):
-    game_uuid_str = str(uuid4())
+@functools.lru_cache(maxsize=1)
+def _template_game_state(settings_id: UUID) -> GameState:
+    """Builds the sample game state once; tests get copies via the sample_game_state fixture."""
+    # Fixture data is known-valid, so skip Pydantic validation for the players
     players = [
-        Player(id=uuid4(), name="P1", role=Role.MAFIA, status=PlayerStatus.ALIVE, is_human=True, persona_id=None),
-        Player(id=uuid4(), name="P2", role=Role.MAFIA, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
-        Player(id=uuid4(), name="P3", role=Role.DETECTIVE, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
-        Player(id=uuid4(), name="P4", role=Role.DOCTOR, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
-        Player(id=uuid4(), name="P5", role=Role.VILLAGER, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
-        Player(id=uuid4(), name="P6", role=Role.VILLAGER, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
-        Player(id=uuid4(), name="P7", role=Role.VILLAGER, status=PlayerStatus.ALIVE, is_human=False, persona_id=None),
+        Player.model_construct(id=uuid4(), name=f"P{i + 1}", role=role, status=PlayerStatus.ALIVE, is_human=(i == 0), persona_id=None)
+        for i, role in enumerate(_SAMPLE_ROLES)
     ]
     return GameState(
-        game_id=game_uuid_str, # Use string ID
+        game_id=uuid4(),
         players=players,
         phase=GamePhase.NIGHT,
         day_number=0,
-        settings_id=sample_game_settings.id,
+        settings_id=settings_id,
         history=[],
         night_actions={},
         votes={}
     )
 
+@pytest.fixture
+def sample_game_state(sample_game_settings):
+    # Shallow copy of the cached template; tests that change fields use _mutate() below.
+    return _template_game_state(sample_game_settings.id).model_copy()
+
+def _only_call(mock: MagicMock) -> tuple:
+    """Asserts `mock` was called exactly once, positionally, and returns that call's args."""
+    assert mock.call_count == 1
+    assert not mock.call_args.kwargs
+    return mock.call_args.args
+
+def _mutate(state: GameState, **overrides) -> GameState:
+    """Returns a new GameState with the given top-level fields overridden.
+
+    Nested data (players, history, ...) is shared with `state`, and nothing is re-validated,
+    so this is only for tests that change scalar fields.
+    """
+    data = state.__dict__.copy()
+    data.update(overrides)
+    return GameState.model_construct(**data)
+
 
 # --- Test Cases ---
 
@@ -121,7 +148,7 @@ def test_create_game_success(game_manager, mock_state_service, sample_game_setti
     assert len(human_players) == 1
     assert human_players[0].name == "You"
     # Assert save was called with the string representation of the game ID
-    mock_state_service.save_game_state.assert_called_once_with(str(created_state.game_id), created_state)
+    assert _only_call(mock_state_service.save_game_state) == (str(created_state.game_id), created_state)
     # Assert game is cached with the string representation of the game ID
     # (GameManager uses string internally now for the cache key)
     assert str(created_state.game_id) in game_manager.active_games
@@ -149,18 +176,18 @@ def test_get_game_cache_miss_load_success(game_manager, mock_state_service, samp
     retrieved_game = game_manager.get_game(game_id_str)
 
     assert retrieved_game == sample_game_state
-    mock_state_service.load_game_state.assert_called_once_with(game_id_str) # Assert load called with string ID
+    assert _only_call(mock_state_service.load_game_state) == (game_id_str,) # Assert load called with string ID
     assert game_id_str in game_manager.active_games # Check cache uses string ID
     assert game_manager.active_games[game_id_str] == sample_game_state
 
 def test_get_game_cache_miss_load_fail(game_manager, mock_state_service):
-    game_id_str = str(uuid4())
+    game_id_str = _UNCACHED_GAME_ID
     mock_state_service.load_game_state.return_value = None
 
     retrieved_game = game_manager.get_game(game_id_str)
 
     assert retrieved_game is None
-    mock_state_service.load_game_state.assert_called_once_with(game_id_str) # Assert load called with string ID
+    assert _only_call(mock_state_service.load_game_state) == (game_id_str,) # Assert load called with string ID
     assert game_id_str not in game_manager.active_games
 
 def test_get_game_invalid_uuid_format(game_manager, mock_state_service):
@@ -169,40 +196,35 @@ def test_get_game_invalid_uuid_format(game_manager, mock_state_service):
     retrieved_game = game_manager.get_game("not-a-uuid")
     assert retrieved_game is None # Should still fail if load_game_state expects UUID internally or fails
     # Check if load was called, depends on load_game_state implementation detail
-    mock_state_service.load_game_state.assert_called_once_with("not-a-uuid")
+    assert _only_call(mock_state_service.load_game_state) == ("not-a-uuid",)
 
 def test_get_game_load_exception(game_manager, mock_state_service):
-    game_id_str = str(uuid4())
-    mock_state_service.load_game_state.side_effect = Exception("Disk read error")
+    game_id_str = _UNCACHED_GAME_ID
+    mock_state_service.load_game_state.side_effect = _DISK_ERR
 
     retrieved_game = game_manager.get_game(game_id_str)
 
     assert retrieved_game is None
-    mock_state_service.load_game_state.assert_called_once_with(game_id_str) # Assert load called with string ID
+    assert _only_call(mock_state_service.load_game_state) == (game_id_str,) # Assert load called with string ID
     assert game_id_str not in game_manager.active_games
 
-@pytest.mark.asyncio # Mark test as async
 async def test_update_game_state_success(game_manager, mock_state_service, mock_websocket_manager, sample_game_state):
     game_id_str = sample_game_state.game_id
     game_manager.active_games[game_id_str] = sample_game_state # Cache uses string ID
 
-    updated_state = sample_game_state.model_copy(deep=True)
-    updated_state.day_number = 1
-    updated_state.phase = GamePhase.DAY
+    updated_state = _mutate(sample_game_state, day_number=1, phase=GamePhase.DAY)
 
     result = await game_manager.update_game_state(game_id_str, updated_state) # Await the async function
 
     assert result is True
-    mock_state_service.save_game_state.assert_called_once_with(game_id_str, updated_state) # Assert save called with string ID
+    assert _only_call(mock_state_service.save_game_state) == (game_id_str, updated_state) # Assert save called with string ID
     assert game_manager.active_games[game_id_str] == updated_state # Check cache uses string ID
     # Assert broadcast was called
     mock_websocket_manager.broadcast_to_game.assert_awaited_once_with(game_id_str, updated_state)
 
-@pytest.mark.asyncio # Mark test as async
 async def test_update_game_state_id_mismatch(game_manager, mock_state_service, mock_websocket_manager, sample_game_state):
     game_id_str = sample_game_state.game_id
-    mismatched_state = sample_game_state.model_copy(deep=True)
-    mismatched_state.game_id = str(uuid4()) # Ensure it's a different string UUID
+    mismatched_state = _mutate(sample_game_state, game_id=uuid4()) # Ensure it's a different UUID
 
     result = await game_manager.update_game_state(game_id_str, mismatched_state) # Await
 
@@ -210,7 +232,6 @@ async def test_update_game_state_id_mismatch(game_manager, mock_state_service, m
     mock_state_service.save_game_state.assert_not_called()
     mock_websocket_manager.broadcast_to_game.assert_not_awaited() # Broadcast should not happen
 
-@pytest.mark.asyncio # Mark test as async
 async def test_update_game_state_invalid_uuid_format(game_manager, mock_state_service, mock_websocket_manager, sample_game_state):
     # Assuming update_game_state handles invalid format early
     result = await game_manager.update_game_state("not-a-uuid", sample_game_state) # Await
@@ -218,46 +239,32 @@ async def test_update_game_state_invalid_uuid_format(game_manager, mock_state_se
     mock_state_service.save_game_state.assert_not_called()
     mock_websocket_manager.broadcast_to_game.assert_not_awaited()
 
-@pytest.mark.asyncio # Mark test as async
-async def test_update_game_state_save_fail(game_manager, mock_state_service, mock_websocket_manager, sample_game_state):
+@pytest.mark.parametrize("failing, error, broadcast_awaited", [("save", _DISK_ERR, False), ("broadcast", _WEBSOCKET_ERR, True)])
+async def test_update_game_state_downstream_failure(game_manager, mock_state_service, mock_websocket_manager, sample_game_state, failing, error, broadcast_awaited):
+    """Test update_game_state returns False when saving or broadcasting fails."""
     game_id_str = sample_game_state.game_id
     game_manager.active_games[game_id_str] = sample_game_state # Cache uses string ID
 
-    updated_state = sample_game_state.model_copy(deep=True)
-    updated_state.day_number = 1
+    updated_state = _mutate(sample_game_state, day_number=1)
 
-    mock_state_service.save_game_state.side_effect = Exception("Disk write error")
+    if failing == "save":
+        mock_state_service.save_game_state.side_effect = error
+    else:
+        mock_websocket_manager.broadcast_to_game.side_effect = error
 
     result = await game_manager.update_game_state(game_id_str, updated_state) # Await
 
-    assert result is False
-    mock_state_service.save_game_state.assert_called_once_with(game_id_str, updated_state) # Assert save called with string ID
-    # Even if save fails, broadcast might still be attempted depending on implementation
-    # The current implementation calls broadcast *after* save, within the try block
-    # So if save fails, broadcast won't be reached.
-    mock_websocket_manager.broadcast_to_game.assert_not_awaited()
-
-@pytest.mark.asyncio # Mark test as async
-async def test_update_game_state_broadcast_fail(game_manager, mock_state_service, mock_websocket_manager, sample_game_state):
-    """Test update_game_state when broadcasting fails (should still return False)."""
-    game_id_str = sample_game_state.game_id
-    game_manager.active_games[game_id_str] = sample_game_state
-
-    updated_state = sample_game_state.model_copy(deep=True)
-    updated_state.day_number = 1
-
-    # Make broadcast fail
-    mock_websocket_manager.broadcast_to_game.side_effect = Exception("WebSocket error")
-
-    result = await game_manager.update_game_state(game_id_str, updated_state)
-
-    assert result is False # Should return False because the overall operation failed
-    # Save should have been called before broadcast
-    mock_state_service.save_game_state.assert_called_once_with(game_id_str, updated_state)
-    # Broadcast should have been awaited
-    mock_websocket_manager.broadcast_to_game.assert_awaited_once_with(game_id_str, updated_state)
-    # Cache should still be updated because it happens before broadcast
-    assert game_manager.active_games[game_id_str] == updated_state
+    assert result is False # The overall operation failed
+    # Save is always attempted first
+    assert _only_call(mock_state_service.save_game_state) == (game_id_str, updated_state) # Assert save called with string ID
+    if broadcast_awaited:
+        # Save succeeded, so the cache was updated before the broadcast failed
+        mock_websocket_manager.broadcast_to_game.assert_awaited_once_with(game_id_str, updated_state)
+        assert game_manager.active_games[game_id_str] == updated_state
+    else:
+        # Broadcast happens *after* save within the try block, so a failed save never reaches it
+        mock_websocket_manager.broadcast_to_game.assert_not_awaited()
+        assert game_manager.active_games[game_id_str] is sample_game_state
 
 def test_remove_game_from_cache(game_manager, sample_game_state):
     game_id_str = sample_game_state.game_id
@@ -274,7 +281,7 @@ def test_remove_game_from_cache_invalid_uuid(game_manager):
     assert game_manager.active_games == initial_cache
 
 def test_remove_game_from_cache_non_existent(game_manager):
-    game_id_str = str(uuid4())
+    game_id_str = _UNCACHED_GAME_ID
     initial_cache = game_manager.active_games.copy()
     game_manager.remove_game_from_cache(game_id_str)
     assert game_manager.active_games == initial_cache 
\ No newline at end of file
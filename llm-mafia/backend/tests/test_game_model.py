@@ -1,6 +1,7 @@
 import pytest
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+from freezegun import freeze_time
 from pydantic import ValidationError
 
 from app.models.game import GamePhase, GameState
@@ -58,6 +59,26 @@ def test_game_state_with_players():
     assert game_state.players[2].role == Role.VILLAGER
 
 
+def test_game_state_living_player_lookups():
+    """Test the living-player helpers used to build prompts and pick targets."""
+    mafia1 = Player(name="Mafia 1", role=Role.MAFIA)
+    mafia2 = Player(name="Mafia 2", role=Role.MAFIA)
+    dead_mafia = Player(name="Mafia 3", role=Role.MAFIA, status=PlayerStatus.DEAD)
+    villager = Player(name="Villager", role=Role.VILLAGER)
+    dead_villager = Player(name="Dead Villager", role=Role.VILLAGER, status=PlayerStatus.DEAD)
+    
+    game_state = GameState(players=[mafia1, dead_villager, mafia2, dead_mafia, villager])
+    
+    assert game_state.living_players() == [mafia1, mafia2, villager]
+    assert game_state.alive_except(mafia1.id) == [mafia2, villager]
+    assert game_state.living_allies(mafia1) == [mafia2]
+    assert game_state.living_allies(villager) == []
+    
+    # Lookups reflect status changes made directly on the players
+    mafia2.status = PlayerStatus.DEAD
+    assert game_state.living_allies(mafia1) == []
+
+
 def test_game_state_add_to_history():
     """Test the add_to_history method of GameState."""
     game_state = GameState()
@@ -65,14 +86,18 @@ def test_game_state_add_to_history():
     # Record the updated_at time before adding to history
     before_update = game_state.updated_at
     
-    # Add an event to history
-    game_state.add_to_history("Game created")
+    # Add an event to history at a fixed later time. Only add_to_history's own
+    # datetime.now() calls are frozen: Pydantic's default_factory keeps a reference
+    # to the real datetime.now, so created_at/updated_at defaults are unaffected.
+    event_time = before_update.replace(microsecond=0) + timedelta(seconds=1)
+    with freeze_time(event_time):
+        game_state.add_to_history("Game created")
     
-    # Check that the event was added
-    assert len(game_state.history) == 1
-    assert "Game created" in game_state.history[0]
+    # Check that the event was added with the frozen timestamp
+    assert game_state.history == [f"[{event_time:%Y-%m-%d %H:%M:%S}] Game created"]
     
     # Check that updated_at was updated
+    assert game_state.updated_at == event_time
     assert game_state.updated_at > before_update
 
 
@@ -115,6 +140,7 @@ def test_game_state_serialization():
     assert recreated_game.history == ["Game started", "Night 1 begins"]
 
 
+@pytest.mark.slow # Builds several Pydantic ValidationErrors
 def test_game_state_validation():
     """Test that GameState validation works as expected."""
     # Invalid phase
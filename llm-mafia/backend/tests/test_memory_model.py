@@ -1,5 +1,5 @@
 import pytest
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import datetime
 from pydantic import ValidationError
 
@@ -7,6 +7,9 @@ from app.models.memory import PublicMemory, PrivateMemory, AIMemory
 from app.models.player import Role
 from app.models.game import GamePhase
 
+# Fixed player IDs shared by every test instead of fresh random ones per test
+_PLAYER_ID1, _PLAYER_ID2, _PLAYER_ID3 = (UUID(int=i, version=4) for i in range(1, 4))
+
 
 def test_public_memory_creation():
     """Test that a PublicMemory can be created with default values."""
@@ -24,8 +27,8 @@ def test_public_memory_creation():
 
 def test_public_memory_custom_values():
     """Test that a PublicMemory can be created with custom values."""
-    player_id1 = uuid4()
-    player_id2 = uuid4()
+    player_id1 = _PLAYER_ID1
+    player_id2 = _PLAYER_ID2
     
     memory = PublicMemory(
         current_day=2,
@@ -67,9 +70,9 @@ def test_public_memory_custom_values():
 
 def test_private_memory_creation():
     """Test that a PrivateMemory can be created with valid values."""
-    player_id1 = uuid4()
-    player_id2 = uuid4()
-    player_id3 = uuid4()
+    player_id1 = _PLAYER_ID1
+    player_id2 = _PLAYER_ID2
+    player_id3 = _PLAYER_ID3
     
     # Required: own_role
     memory = PrivateMemory(own_role=Role.MAFIA)
@@ -118,7 +121,7 @@ def test_private_memory_creation():
 
 def test_ai_memory_creation():
     """Test that an AIMemory can be created with valid values."""
-    player_id = uuid4()
+    player_id = _PLAYER_ID1
     
     # Create with required fields
     memory = AIMemory(
@@ -140,7 +143,7 @@ def test_ai_memory_creation():
 
 def test_ai_memory_get_memory_context():
     """Test that get_memory_context returns the expected structure."""
-    player_id = uuid4()
+    player_id = _PLAYER_ID1
     
     memory = AIMemory(
         player_id=player_id,
@@ -176,8 +179,8 @@ def test_ai_memory_get_memory_context():
 
 def test_ai_memory_serialization():
     """Test that AIMemory can be serialized to and from JSON."""
-    player_id = uuid4()
-    target_id = uuid4()
+    player_id = _PLAYER_ID1
+    target_id = _PLAYER_ID2
     
     memory = AIMemory(
         player_id=player_id,
@@ -208,7 +211,7 @@ def test_ai_memory_serialization():
     assert len(memory_dict["public"]["key_events"]) == 1
     
     # Recreate from dict
-    recreated_memory = AIMemory(**memory_dict)
+    recreated_memory = AIMemory.model_validate(memory_dict)
     
     # Check deserialization
     assert recreated_memory.id == memory.id
@@ -219,25 +222,13 @@ def test_ai_memory_serialization():
     assert recreated_memory.public.current_phase == GamePhase.DAY
 
 
-def test_memory_validation():
+@pytest.mark.parametrize("model, kwargs", [
+    (AIMemory, {"player_id": _PLAYER_ID1}),  # private is required for AIMemory
+    (PrivateMemory, {}),  # own_role is required for PrivateMemory
+    (PrivateMemory, {"own_role": "invalid_role"}),
+    (PublicMemory, {"current_phase": "invalid_phase"}),
+], ids=["missing_private", "missing_own_role", "invalid_own_role", "invalid_current_phase"])
+def test_memory_validation(model, kwargs):
     """Test that memory validation works as expected."""
-    player_id = uuid4()
-    
-    # Missing required field (private is required for AIMemory)
-    with pytest.raises(ValidationError):
-        AIMemory(
-            player_id=player_id
-            # Missing private
-        )
-    
-    # Missing required field (own_role is required for PrivateMemory)
-    with pytest.raises(ValidationError):
-        PrivateMemory()  # Missing own_role
-    
-    # Invalid value for own_role
-    with pytest.raises(ValidationError):
-        PrivateMemory(own_role="invalid_role")
-    
-    # Invalid enum for current_phase
     with pytest.raises(ValidationError):
-        PublicMemory(current_phase="invalid_phase") 
\ No newline at end of file
+        model(**kwargs)
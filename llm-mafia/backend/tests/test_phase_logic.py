@@ -1,8 +1,12 @@
 import pytest
 import asyncio # Add asyncio
+import threading
 from unittest.mock import patch, MagicMock, AsyncMock # Add AsyncMock
 from typing import List
 import uuid
+import itertools
+import functools
+from collections import Counter
 from datetime import datetime
 
 # Models to test and mock
@@ -24,26 +28,38 @@ from app.services.llm_service import LLMServiceError
 # Import game_manager for mocking its update method
 from app.services.game_manager import game_manager
 
+# Test IDs come from a counter rather than uuid4(): no urandom read per ID, and the IDs in
+# failure output are short and stable. UUID4 fields require the version bits to be set.
+_uuid_counter = itertools.count(1)
+
+def _next_uuid() -> uuid.UUID:
+    return uuid.UUID(int=next(_uuid_counter), version=4)
+
+# Fixed timestamp for canned announcements and messages; the tests only match on suffixes.
+_T0 = datetime(2024, 1, 1)
+
 # Helper to create players
 def create_test_players(roles: List[Role]) -> List[Player]:
-    players = []
-    human_assigned = False
-    for i, role in enumerate(roles):
-        is_human = False
-        if not human_assigned and role != Role.MAFIA:
-             is_human = True
-             human_assigned = True
-        players.append(Player(
-            id=uuid.uuid4(),
+    # The first non-Mafia player is human (player 0 if everyone is Mafia)
+    human_idx = next((i for i, role in enumerate(roles) if role != Role.MAFIA), 0)
+    # model_construct skips validation: the inputs are already typed, and the
+    # Player schema itself is covered by test_player_model.py
+    return [
+        Player.model_construct(
+            id=_next_uuid(),
             name=f"Player {i+1}",
             role=role,
             status=PlayerStatus.ALIVE,
-            is_human=is_human,
+            is_human=(i == human_idx),
             persona_id=None
-        ))
-    if not human_assigned and players:
-        players[0].is_human = True
-    return players
+        )
+        for i, role in enumerate(roles)
+    ]
+
+# GameSettings validation only depends on the role counts, so it runs once per distinct setup
+@functools.lru_cache(maxsize=32)
+def _settings_template(player_count: int, role_items: tuple) -> GameSettings:
+    return GameSettings(player_count=player_count, role_distribution=dict(role_items))
 
 # Helper to create a basic game state
 def create_test_game_state(players: List[Player], phase: GamePhase = GamePhase.NIGHT, day: int = 1) -> GameState:
@@ -57,11 +73,13 @@ def create_test_game_state(players: List[Player], phase: GamePhase = GamePhase.N
          raise ValueError("Test setup error: Need at least one Mafia player for valid GameSettings.")
 
     # Calculate actual role distribution from the players list
-    role_dist = {r.value: sum(1 for p in players if p.role == r) for r in Role}
+    role_counts = Counter(p.role for p in players) # One pass over the players
+    role_dist = {r.value: role_counts[r] for r in Role}
 
-    settings = GameSettings(player_count=player_count, role_distribution=role_dist, id=uuid.uuid4())
-    game_id_uuid = uuid.uuid4()
-    return GameState(
+    settings = _settings_template(player_count, tuple(role_dist.items())).model_copy(update={"id": _next_uuid()})
+    game_id_uuid = _next_uuid()
+    # Unvalidated like the players above; test_game_model.py covers the GameState schema
+    return GameState.model_construct(
         game_id=game_id_uuid,
         players=players,
         phase=phase,
@@ -73,20 +91,31 @@ def create_test_game_state(players: List[Player], phase: GamePhase = GamePhase.N
     )
 
 # --- Test Fixtures ---
-@pytest.fixture
-def mock_state_service():
-    # This mock is no longer needed directly by phase_logic tests
-    # as phase_logic now calls game_manager.update_game_state
-    pass # Keep fixture for potential other uses, but phase_logic tests won't use it
+# phase_logic's collaborators are patched once for the whole module: autospeccing llm_service
+# is the expensive part of `patch`, so the mocks are only reset between tests (like the
+# module-scoped patches in test_game_endpoints.py). Every test runs against them, so no
+# test reaches the real LLM service or game manager.
+@pytest.fixture(scope="module")
+def _phase_logic_patches():
+    with patch.object(phase_logic.game_manager, 'update_game_state', new_callable=AsyncMock) as mock_update, \
+         patch("app.services.phase_logic.llm_service", autospec=True) as mock_llm:
+        yield mock_update, mock_llm
+
+@pytest.fixture(autouse=True)
+def _reset_phase_logic_patches(_phase_logic_patches):
+    mock_update, mock_llm = _phase_logic_patches
+    mock_update.reset_mock(return_value=True, side_effect=True)
+    mock_update.return_value = True # Successful update by default
+    mock_llm.reset_mock(return_value=True, side_effect=True)
+    # By default no AI acts or votes, as with a service that has no client. Day messages keep
+    # the autospec default (a truthy mock), so a Day transition saves the AI messages too.
+    mock_llm.determine_ai_night_action.return_value = None
+    mock_llm.determine_ai_vote.return_value = None
 
 @pytest.fixture
-def mock_game_manager_update():
-    """Mocks the game_manager.update_game_state async method."""
-    # Patch the *instance* of game_manager imported into the phase_logic module
-    with patch.object(phase_logic.game_manager, 'update_game_state', new_callable=AsyncMock) as mock_update:
-        # Configure the mock to return True by default (successful update)
-        mock_update.return_value = True
-        yield mock_update
+def mock_game_manager_update(_phase_logic_patches):
+    """The mocked game_manager.update_game_state async method, reset for each test."""
+    return _phase_logic_patches[0]
 
 @pytest.fixture
 def mock_resolve_actions():
@@ -120,13 +149,14 @@ def mock_resolve_actions():
     patcher.stop()
 
 @pytest.fixture
-def mock_llm_service():
-    with patch("app.services.phase_logic.llm_service", autospec=True) as mock_llm:
-        yield mock_llm
-
-@pytest.fixture
-def game_state_night() -> GameState:
-    """Provides a standard game state fixture in the Night phase for action tests."""
+def mock_llm_service(_phase_logic_patches):
+    """The autospecced llm_service used by phase_logic, reset for each test."""
+    return _phase_logic_patches[1]
+
+# The standard Night state is built (Players, GameSettings and GameState validation) once per
+# session; game_state_night hands each test its own deep copy, since phase logic mutates it.
+@pytest.fixture(scope="session")
+def _game_state_night_template() -> GameState:
     # Use a standard 7-player setup for these tests
     players = create_test_players([
         Role.MAFIA,
@@ -153,15 +183,31 @@ def game_state_night() -> GameState:
     state.history = [state.history[0]] 
     return state
 
-# --- Test Cases ---
+@pytest.fixture
+def game_state_night(_game_state_night_template: GameState) -> GameState:
+    """Provides a standard game state fixture in the Night phase for action tests."""
+    return _game_state_night_template.model_copy(deep=True)
 
-@pytest.mark.asyncio # Mark as async
-async def test_advance_to_night(mock_game_manager_update):
-    # Use 5 players: 1 Mafia, 4 Villagers
+# 1 Mafia, 4 Villagers; the human is the first Villager. Tests pick the starting phase with
+# @pytest.mark.parametrize("five_player_state", [phase], indirect=True).
+@functools.lru_cache(maxsize=None)
+def _five_player_template(phase: GamePhase) -> GameState:
     players = create_test_players([
         Role.VILLAGER, Role.MAFIA, Role.VILLAGER, Role.VILLAGER, Role.VILLAGER
     ])
-    game_state = create_test_game_state(players, phase=GamePhase.DAY, day=1)
+    return create_test_game_state(players, phase=phase, day=1)
+
+@pytest.fixture
+def five_player_state(request) -> GameState:
+    """Provides a fresh copy of the 5-player state in the phase given by request.param."""
+    return _five_player_template(request.param).model_copy(deep=True)
+
+# --- Test Cases ---
+
+@pytest.mark.parametrize("five_player_state", [GamePhase.DAY], indirect=True)
+async def test_advance_to_night(mock_game_manager_update, five_player_state):
+    # Use 5 players: 1 Mafia, 4 Villagers
+    game_state = five_player_state
     game_id_str = str(game_state.game_id)
 
     new_state = await phase_logic.advance_to_night(game_state, game_id_str) # Await the call
@@ -175,13 +221,10 @@ async def test_advance_to_night(mock_game_manager_update):
     assert mock_game_manager_update.await_count == 2
     mock_game_manager_update.assert_awaited_with(game_id_str, new_state) # Check last call
 
-@pytest.mark.asyncio # Mark as async
-async def test_advance_to_night_increments_day(mock_game_manager_update):
+@pytest.mark.parametrize("five_player_state", [GamePhase.VOTING], indirect=True)
+async def test_advance_to_night_increments_day(mock_game_manager_update, five_player_state):
     # Use 5 players
-    players = create_test_players([
-        Role.VILLAGER, Role.MAFIA, Role.VILLAGER, Role.VILLAGER, Role.VILLAGER
-    ])
-    game_state = create_test_game_state(players, phase=GamePhase.VOTING, day=1)
+    game_state = five_player_state
     game_id_str = str(game_state.game_id)
 
     new_state = await phase_logic.advance_to_night(game_state, game_id_str) # Await the call
@@ -195,7 +238,6 @@ async def test_advance_to_night_increments_day(mock_game_manager_update):
     assert mock_game_manager_update.await_count == 2
     mock_game_manager_update.assert_awaited_with(game_id_str, new_state)
 
-@pytest.mark.asyncio # Mark as async
 async def test_advance_to_day_no_kill(mock_game_manager_update, mock_resolve_actions, mock_llm_service):
     # Use 5 players: 1 M, 1 Dt, 3 V
     players = create_test_players([
@@ -227,7 +269,6 @@ async def test_advance_to_day_no_kill(mock_game_manager_update, mock_resolve_act
     # Check LLM service was NOT called (no AI messages generated in this test yet)
     # assert mock_llm_service.generate_ai_day_message.call_count == 0 # Removed this assertion
 
-@pytest.mark.asyncio # Mark as async
 async def test_advance_to_day_with_kill(mock_game_manager_update, mock_resolve_actions, mock_llm_service):
     # Use 5 players: 1 M, 1 Dt, 3 V
     players = create_test_players([
@@ -243,7 +284,7 @@ async def test_advance_to_day_with_kill(mock_game_manager_update, mock_resolve_a
     mock_resolve_actions.mock_config.clear()
     mock_resolve_actions.mock_config["killed"] = killed_player
     mock_resolve_actions.mock_config["saved"] = None
-    mock_resolve_actions.mock_config["announcements"] = [f"[{datetime.now()}] {kill_announcement_suffix}"]
+    mock_resolve_actions.mock_config["announcements"] = [f"[{_T0}] {kill_announcement_suffix}"]
 
     new_state = await phase_logic.advance_to_day(game_state, game_id_str) # Await the call
 
@@ -261,13 +302,11 @@ async def test_advance_to_day_with_kill(mock_game_manager_update, mock_resolve_a
     # Check LLM service was NOT called (no AI messages generated in this test yet)
     # assert mock_llm_service.generate_ai_day_message.call_count == 0 # Removed this assertion
 
-@pytest.mark.asyncio # Mark as async
-async def test_advance_to_day_innocent_win(mock_game_manager_update, mock_resolve_actions):
+@pytest.mark.parametrize("five_player_state", [GamePhase.NIGHT], indirect=True)
+async def test_advance_to_day_innocent_win(mock_game_manager_update, mock_resolve_actions, five_player_state):
     # Setup: 1 Mafia, 4 Villagers. Mafia gets killed.
-    players = create_test_players([
-        Role.VILLAGER, Role.MAFIA, Role.VILLAGER, Role.VILLAGER, Role.VILLAGER
-    ])
-    game_state = create_test_game_state(players, phase=GamePhase.NIGHT, day=1)
+    game_state = five_player_state
+    players = game_state.players
     game_id_str = str(game_state.game_id)
     killed_player = next(p for p in players if p.role == Role.MAFIA)
     initial_history_len = len(game_state.history)
@@ -278,7 +317,7 @@ async def test_advance_to_day_innocent_win(mock_game_manager_update, mock_resolv
     mock_resolve_actions.mock_config.clear()
     mock_resolve_actions.mock_config["killed"] = killed_player
     mock_resolve_actions.mock_config["saved"] = None
-    mock_resolve_actions.mock_config["announcements"] = [f"[{datetime.now()}] {kill_announcement_suffix}"]
+    mock_resolve_actions.mock_config["announcements"] = [f"[{_T0}] {kill_announcement_suffix}"]
 
     new_state = await phase_logic.advance_to_day(game_state, game_id_str) # Await
 
@@ -292,12 +331,9 @@ async def test_advance_to_day_innocent_win(mock_game_manager_update, mock_resolv
     assert mock_game_manager_update.await_count == 1
     mock_game_manager_update.assert_awaited_once_with(game_id_str, new_state)
 
-@pytest.mark.asyncio # Mark as async
-async def test_advance_to_voting(mock_game_manager_update, mock_llm_service): # Use fixture
-    players = create_test_players([
-        Role.VILLAGER, Role.MAFIA, Role.VILLAGER, Role.VILLAGER, Role.VILLAGER
-    ])
-    game_state = create_test_game_state(players, phase=GamePhase.DAY, day=1)
+@pytest.mark.parametrize("five_player_state", [GamePhase.DAY], indirect=True)
+async def test_advance_to_voting(mock_game_manager_update, mock_llm_service, five_player_state): # Use fixture
+    game_state = five_player_state
     game_id_str = str(game_state.game_id)
 
     # Mock LLM service via the fixture to avoid unexpected votes/history
@@ -324,9 +360,7 @@ async def test_advance_to_voting(mock_game_manager_update, mock_llm_service): #
     else: # Check the first call if no AI vote save occurred
          mock_game_manager_update.assert_awaited_once_with(game_id_str, game_state) # Check the first call
 
-@pytest.mark.asyncio
-@patch("app.services.phase_logic.llm_service", autospec=True)
-async def test_advance_to_voting_triggers_ai_votes(mock_llm_service_local, mock_game_manager_update):
+async def test_advance_to_voting_triggers_ai_votes(mock_llm_service, mock_game_manager_update):
     players = create_test_players([
         Role.MAFIA, # AI
         Role.DOCTOR, # AI
@@ -349,15 +383,15 @@ async def test_advance_to_voting_triggers_ai_votes(mock_llm_service_local, mock_
     mock_votes = {p.id: players[0].id for p in ai_players} # Everyone votes for Player 0 (Mafia)
     def vote_side_effect(player, gs):
         return mock_votes.get(player.id)
-    mock_llm_service_local.determine_ai_vote.side_effect = vote_side_effect
+    mock_llm_service.determine_ai_vote.side_effect = vote_side_effect
 
     new_state = await phase_logic.advance_to_voting(game_state, game_id_str) # Await
 
     assert new_state.phase == GamePhase.VOTING
     # Check LLM service was called for each living AI player
-    assert mock_llm_service_local.determine_ai_vote.call_count == len(ai_players)
+    assert mock_llm_service.determine_ai_vote.call_count == len(ai_players)
     for ai_p in ai_players:
-        mock_llm_service_local.determine_ai_vote.assert_any_call(ai_p, game_state)
+        mock_llm_service.determine_ai_vote.assert_any_call(ai_p, game_state)
     
     # Check votes were recorded in game state
     assert len(new_state.votes) == len(ai_players)
@@ -371,9 +405,7 @@ async def test_advance_to_voting_triggers_ai_votes(mock_llm_service_local, mock_
     assert mock_game_manager_update.await_count == 2
     mock_game_manager_update.assert_awaited_with(game_id_str, new_state)
 
-@pytest.mark.asyncio
-@patch("app.services.phase_logic.llm_service", autospec=True)
-async def test_advance_to_voting_handles_llm_error(mock_llm_service_local, mock_game_manager_update, caplog):
+async def test_advance_to_voting_handles_llm_error(mock_llm_service, mock_game_manager_update, caplog):
     players = create_test_players([
         Role.MAFIA, # AI
         Role.VILLAGER, # AI
@@ -404,12 +436,12 @@ async def test_advance_to_voting_handles_llm_error(mock_llm_service_local, mock_
             return players[0].id # Vote for Mafia
         else:
             return None # Other AIs don't vote
-    mock_llm_service_local.determine_ai_vote.side_effect = vote_side_effect
+    mock_llm_service.determine_ai_vote.side_effect = vote_side_effect
 
     new_state = await phase_logic.advance_to_voting(game_state, game_id_str) # Await
 
     assert new_state.phase == GamePhase.VOTING
-    assert mock_llm_service_local.determine_ai_vote.call_count == len(ai_player_ids) # Called for all AIs
+    assert mock_llm_service.determine_ai_vote.call_count == len(ai_player_ids) # Called for all AIs
     
     # Check only the successful vote was recorded
     assert len(new_state.votes) == 1
@@ -429,7 +461,6 @@ async def test_advance_to_voting_handles_llm_error(mock_llm_service_local, mock_
     assert mock_game_manager_update.await_count == 2
     mock_game_manager_update.assert_awaited_with(game_id_str, new_state)
 
-@pytest.mark.asyncio # Mark as async
 async def test_process_voting_lynch(mock_game_manager_update):
     # Use 5 players: 1 M, 1 Dr, 3 V
     players = create_test_players([
@@ -465,8 +496,7 @@ async def test_process_voting_lynch(mock_game_manager_update):
     assert mock_game_manager_update.await_count >= 2
     mock_game_manager_update.assert_awaited_with(game_id_str, final_state)
 
-@pytest.mark.asyncio # Mark as async
-async def test_process_voting_tie(mock_game_manager_update):
+async def test_process_voting_tie(mock_game_manager_update, mock_llm_service):
     # Use 6 players: 1 M, 1 Dr, 1 Dt, 3 V
     players = create_test_players([
         Role.VILLAGER, Role.MAFIA, Role.DOCTOR, Role.DETECTIVE, Role.VILLAGER, Role.VILLAGER
@@ -486,9 +516,8 @@ async def test_process_voting_tie(mock_game_manager_update):
     }
 
     # Mock AI actions within advance_to_night to control save count
-    with patch("app.services.phase_logic.llm_service", autospec=True) as mock_llm:
-        mock_llm.determine_ai_night_action.return_value = None # No AI actions
-        final_state = await phase_logic.process_voting_and_advance(game_state, game_id_str, votes) # Await
+    mock_llm_service.determine_ai_night_action.return_value = None # No AI actions
+    final_state = await phase_logic.process_voting_and_advance(game_state, game_id_str, votes) # Await
 
     assert final_state.phase == GamePhase.NIGHT
     assert all(p.status == PlayerStatus.ALIVE for p in players)
@@ -500,7 +529,6 @@ async def test_process_voting_tie(mock_game_manager_update):
     assert mock_game_manager_update.await_count >= 2
     mock_game_manager_update.assert_awaited_with(game_id_str, final_state)
 
-@pytest.mark.asyncio # Mark as async
 async def test_process_voting_mafia_win_lynch(mock_game_manager_update):
     # Setup: 2 M, 3 V. Lynch a Villager -> 2 M, 2 V -> Mafia win
     players = create_test_players([
@@ -525,8 +553,7 @@ async def test_process_voting_mafia_win_lynch(mock_game_manager_update):
     assert mock_game_manager_update.await_count == 2
     mock_game_manager_update.assert_awaited_with(game_id_str, final_state)
 
-@pytest.mark.asyncio # Mark as async
-async def test_process_voting_mafia_win_no_lynch(mock_game_manager_update):
+async def test_process_voting_mafia_win_no_lynch(mock_game_manager_update, mock_llm_service):
     # Setup: 2 M, 3 V (5 total). Tie vote -> Game continues (2 M vs 3 V)
     players = create_test_players([
         Role.VILLAGER, Role.MAFIA, Role.VILLAGER, Role.MAFIA, Role.VILLAGER
@@ -545,9 +572,8 @@ async def test_process_voting_mafia_win_no_lynch(mock_game_manager_update):
     } # 2 votes M1, 2 votes V1 -> Tie
 
     # Mock AI actions within advance_to_night to control save count
-    with patch("app.services.phase_logic.llm_service", autospec=True) as mock_llm:
-        mock_llm.determine_ai_night_action.return_value = None # No AI actions
-        final_state = await phase_logic.process_voting_and_advance(game_state, game_id_str, votes) # Await
+    mock_llm_service.determine_ai_night_action.return_value = None # No AI actions
+    final_state = await phase_logic.process_voting_and_advance(game_state, game_id_str, votes) # Await
 
     # Tie vote means no lynch, game continues to Night
     assert final_state.phase == GamePhase.NIGHT
@@ -562,9 +588,23 @@ async def test_process_voting_mafia_win_no_lynch(mock_game_manager_update):
     assert mock_game_manager_update.await_count >= 2
     mock_game_manager_update.assert_awaited_with(game_id_str, final_state)
 
-@pytest.mark.asyncio
-@patch("app.services.phase_logic.llm_service", autospec=True)
-async def test_advance_to_day_triggers_ai_messages(mock_llm_service_local, mock_game_manager_update, mock_resolve_actions, game_state_night):
+async def test_advance_to_night_runs_ai_actions_concurrently(mock_llm_service, mock_game_manager_update, game_state_night):
+    game_id_str = str(game_state_night.game_id)
+    night_actors = [p for p in game_state_night.players if not p.is_human and p.status == PlayerStatus.ALIVE and p.role != Role.VILLAGER]
+
+    # Each call blocks until every night actor's call has started, which only happens if they run concurrently
+    barrier = threading.Barrier(len(night_actors), timeout=5)
+    def action_side_effect(player, gs):
+        barrier.wait()
+        return None
+    mock_llm_service.determine_ai_night_action.side_effect = action_side_effect
+
+    final_state = await phase_logic.advance_to_night(game_state_night, game_id_str) # Await
+
+    assert mock_llm_service.determine_ai_night_action.call_count == len(night_actors)
+    assert not any("Unexpected error" in msg for msg in final_state.history)
+
+async def test_advance_to_day_triggers_ai_messages(mock_llm_service, mock_game_manager_update, mock_resolve_actions, game_state_night):
     # Ensure the game state starts in NIGHT phase for advance_to_day
     game_state_night.phase = GamePhase.NIGHT # Set phase correctly
     game_id_str = str(game_state_night.game_id)
@@ -575,9 +615,9 @@ async def test_advance_to_day_triggers_ai_messages(mock_llm_service_local, mock_
     # Configure mock LLM service to return some messages
     def msg_side_effect(player, gs):
         if player in ai_players:
-            return ChatMessage(player_id=player.id, message=f"AI {player.name} says hi!", timestamp=datetime.now())
+            return ChatMessage(player_id=player.id, message=f"AI {player.name} says hi!", timestamp=_T0)
         return None
-    mock_llm_service_local.generate_ai_day_message.side_effect = msg_side_effect
+    mock_llm_service.generate_ai_day_message.side_effect = msg_side_effect
 
     initial_chat_len = len(game_state_night.chat_history)
 
@@ -587,7 +627,7 @@ async def test_advance_to_day_triggers_ai_messages(mock_llm_service_local, mock_
     # Assertions
     assert final_state.phase == GamePhase.DAY # Check phase transition occurred
     # Check call count directly
-    actual_call_count = mock_llm_service_local.generate_ai_day_message.call_count
+    actual_call_count = mock_llm_service.generate_ai_day_message.call_count
     assert actual_call_count == num_ai_players
     assert len(final_state.chat_history) == initial_chat_len + num_ai_players
     assert all(f"AI {p.name} says hi!" in msg.message for p, msg in zip(ai_players, final_state.chat_history[initial_chat_len:]))
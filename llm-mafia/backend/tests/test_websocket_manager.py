@@ -65,7 +65,6 @@ def create_mock_ws():
     return ws
 
 # Tests for WebSocketManager
-@pytest.mark.asyncio
 async def test_connect_single_client(manager: WebSocketManager, mock_websocket: MagicMock):
     """Test connecting a single client to a game."""
     game_id = "game1"
@@ -75,7 +74,6 @@ async def test_connect_single_client(manager: WebSocketManager, mock_websocket:
     assert mock_websocket in manager.active_connections[game_id]
     assert len(manager.active_connections[game_id]) == 1
 
-@pytest.mark.asyncio
 async def test_connect_multiple_clients_same_game(manager: WebSocketManager):
     """Test connecting multiple clients to the same game."""
     game_id = "game_multi"
@@ -90,7 +88,6 @@ async def test_connect_multiple_clients_same_game(manager: WebSocketManager):
     assert ws2 in manager.active_connections[game_id]
     assert len(manager.active_connections[game_id]) == 2
 
-@pytest.mark.asyncio
 async def test_connect_multiple_games(manager: WebSocketManager):
     """Test connecting clients to different games."""
     game_id1 = "game_a"
@@ -106,7 +103,6 @@ async def test_connect_multiple_games(manager: WebSocketManager):
     assert ws_b in manager.active_connections[game_id2]
     assert len(manager.active_connections[game_id2]) == 1
 
-@pytest.mark.asyncio
 async def test_disconnect_client(manager: WebSocketManager, mock_websocket: MagicMock):
     """Test disconnecting a client, removing the game entry."""
     game_id = "game_disconnect"
@@ -116,7 +112,6 @@ async def test_disconnect_client(manager: WebSocketManager, mock_websocket: Magi
     # Since it was the only client, the game_id key should be removed
     assert game_id not in manager.active_connections
 
-@pytest.mark.asyncio
 async def test_disconnect_one_of_multiple(manager: WebSocketManager):
     """Test disconnecting one client when multiple are connected."""
     game_id = "game_multi_disconnect"
@@ -131,14 +126,12 @@ async def test_disconnect_one_of_multiple(manager: WebSocketManager):
     assert ws2 in manager.active_connections[game_id]
     assert len(manager.active_connections[game_id]) == 1
 
-@pytest.mark.asyncio
 async def test_disconnect_nonexistent_game(manager: WebSocketManager, mock_websocket: MagicMock):
     """Test disconnecting from a game_id that doesn't exist."""
     manager.disconnect(mock_websocket, "nonexistent_game")
     # Should not raise an error and state should be unchanged
     assert "nonexistent_game" not in manager.active_connections
 
-@pytest.mark.asyncio
 async def test_disconnect_nonexistent_client_in_game(manager: WebSocketManager, mock_websocket: MagicMock):
     """Test disconnecting a specific websocket not present in an existing game raises KeyError."""
     game_id = "game_exists"
@@ -159,7 +152,6 @@ async def test_disconnect_nonexistent_client_in_game(manager: WebSocketManager,
     assert len(manager.active_connections[game_id]) == 1
 
 
-@pytest.mark.asyncio
 async def test_broadcast_to_game(manager: WebSocketManager, game_state_fixture: GameState):
     """Test broadcasting a message to all clients in a specific game."""
     game_id = game_state_fixture.game_id
@@ -172,7 +164,6 @@ async def test_broadcast_to_game(manager: WebSocketManager, game_state_fixture:
     ws1.send_text.assert_awaited_once_with(message_json)
     ws2.send_text.assert_awaited_once_with(message_json)
 
-@pytest.mark.asyncio
 async def test_broadcast_to_empty_game(manager: WebSocketManager, game_state_fixture: GameState):
     """Test broadcasting to a game with no clients (should not error or send)."""
     game_id = game_state_fixture.game_id
@@ -181,7 +172,6 @@ async def test_broadcast_to_empty_game(manager: WebSocketManager, game_state_fix
         await manager.broadcast_to_game(game_id, game_state_fixture)
         mock_send.assert_not_awaited()
 
-@pytest.mark.asyncio
 async def test_broadcast_with_disconnection(manager: WebSocketManager, game_state_fixture: GameState):
     """Test broadcasting handles exceptions during sending and disconnects the faulty client."""
     game_id = game_state_fixture.game_id
@@ -207,7 +197,6 @@ async def test_broadcast_with_disconnection(manager: WebSocketManager, game_stat
     assert ws2_disconnected not in manager.active_connections[game_id]
     assert len(manager.active_connections[game_id]) == 1
 
-@pytest.mark.asyncio
 async def test_broadcast_to_multiple_games(manager: WebSocketManager, game_state_fixture: GameState):
     """Test broadcasting only sends to clients in the specified game."""
     game_id1 = game_state_fixture.game_id